@@ -3,12 +3,20 @@
 __copyright__ = "Copyright (C) 2022 Andreas Andersson"
 __license__ = "The MIT License"
 
-import enum, requests, re, cmd
-import datetime, dateutil.relativedelta
-import math, statistics
+import enum, requests_cache, re, cmd
+import datetime, calendar
+import math, statistics, bisect, heapq
+import concurrent.futures
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from dataclasses import dataclass
 
+_RE_INT = re.compile(r'\d+')
+_RE_MONEY = re.compile(r'[\d,\.]+')
+_RE_DATE_RANGE = re.compile(r'(?:(\d+)-([A-Z][a-z]{2})(?:-(\d{4}))?\s+to\s+)?(\d+)-([A-Z][a-z]{2})-(\d{4})')
+_MONTHS = {'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+           'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12}
+
 @dataclass
 class TournamentResult:
     """Dataclass to represent a disc golf tournament result."""
@@ -57,6 +65,12 @@ class Player:
         earnings (float): Career earnings in USD.
     """
 
+    # Shared by all players so that connections to the PDGA website are kept alive and reused. Created by _get_session
+    # the first time a page is downloaded.
+    _session = None
+    _timeout = 30
+    _max_workers = 8
+
     def __init__(self, pdga_number):
         """Create a new Player instance and populate attributes.
         
@@ -66,26 +80,25 @@ class Player:
             pdga_number (int): The players PDGA number.
         """
         self.pdga_number = str(pdga_number)
+        # Results for years that are over, by year.
+        self._year_cache: dict[int, list[TournamentResult]] = {}
 
         # Get and parse player info from pdga.com:
-        html = requests.get(f'https://www.pdga.com/player/{self.pdga_number}').text
-        soup = BeautifulSoup(html, 'html.parser')
-        ul = soup.find('ul', class_='player-info')
+        soup = self._get_page(f'https://www.pdga.com/player/{self.pdga_number}')
         self.name = soup.find('h1', id='page-title').text.split('#')[0].strip()
         if self.name == 'Page not found':
             raise InvalidPDGANumberError
+        # Walk the player info list once and index the items by class.
+        ul = soup.find('ul', class_='player-info')
+        info = {li['class'][0]: li.text for li in ul.find_all('li', recursive=False) if li.get('class')}
         # Split at "Classification" to mitigate that the location li-tag isn't closed.
-        self.location = ul.find('li', class_='location').text.split('Classification:')[0].removeprefix('Location:').strip()
-        self.since = int(re.findall(r'\d+', ul.find('li', class_='join-date').text)[0])
-        rating = ul.find('li', class_='current-rating')
-        self.rating = int(re.findall(r'\d+', rating.text)[0]) if rating else None
-        self.classification = ul.find('li', class_='classification').text.removeprefix('Classification:').strip()
-        events = ul.find('li', class_='career-events')
-        self.events = int(re.findall(r'\d+', events.text)[0]) if events else 0
-        wins = ul.find('li', class_='career-wins')
-        self.wins = int(re.findall(r'\d+', wins.text)[0]) if wins else 0
-        earnings = ul.find('li', class_='career-earnings')
-        self.earnings = float(re.findall(r'[\d,\.]+', earnings.text)[0].replace(',', '')) if earnings else 0.0
+        self.location = info['location'].split('Classification:')[0].removeprefix('Location:').strip()
+        self.since = int(_RE_INT.findall(info['join-date'])[0])
+        self.rating = int(_RE_INT.findall(info['current-rating'])[0]) if 'current-rating' in info else None
+        self.classification = info['classification'].removeprefix('Classification:').strip()
+        self.events = int(_RE_INT.findall(info['career-events'])[0]) if 'career-events' in info else 0
+        self.wins = int(_RE_INT.findall(info['career-wins'])[0]) if 'career-wins' in info else 0
+        self.earnings = float(_RE_MONEY.findall(info['career-earnings'])[0].replace(',', '')) if 'career-earnings' in info else 0.0
 
     def included_round_ratings(self) -> list[RoundRating]:
         """Get all round ratings included in latest rating.
@@ -96,8 +109,7 @@ class Player:
             list[RoundRating]: Round ratings and their dates included in latest rating.
         """
         # Get ratings detail for player from the PDGA website
-        html = requests.get(f'https://www.pdga.com/player/{self.pdga_number}/details').text
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = self._get_page(f'https://www.pdga.com/player/{self.pdga_number}/details')
         # Find all included ratings (<td class="round-rating"> within <tr class="included").
         ratings = []
         for record in soup.find_all('tr', class_='included'):
@@ -125,50 +137,60 @@ class Player:
             start_date = datetime.date.today()
         if end_date > datetime.date.today():
             end_date = datetime.date.today()
-        # Get events
-        for year in range(start_date.year, end_date.year + 1):
-            efy = self.events_from_year(year)
-            for event in efy:
-                if event.end_date >= start_date and event.start_date <= end_date:
-                    events.append(event)
+        # Get events. Each year is a separate page, so fetch them concurrently.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            years = executor.map(lambda year: self.events_from_year(year, (start_date, end_date)),
+                                 range(start_date.year, end_date.year + 1))
+        for efy in years:
+            events += efy
         return events
 
-    def events_from_year(self, year: int) -> list[TournamentResult]:
+    def events_from_year(self, year: int, date_range: tuple[datetime.date, datetime.date]=None) -> list[TournamentResult]:
         """Get all events played given year.
 
         NOTE: This function will have to be updated if the PDGA website changes.
         
         Args:
             year (int): The year to get events for.
+            date_range (tuple[date, date]): Only include events played, at least partly, from the first to the last
+                of these dates, or None to include all events. (Default: None)
 
         Returns:
             List[TournamentResult]: Tournament results for every event played the given year.
         """
-        html = requests.get(f'https://www.pdga.com/player/{self.pdga_number}/stats/{str(year)}').text
-        soup = BeautifulSoup(html, 'html.parser')
-        table_containers = soup.find_all(class_='table-container')
-        rows = []
-        for tc in table_containers:
-            table = tc.find('table')
-            rows += table.find_all('tr', {"class": ["odd", "even"]})
+        # Results from years that are over won't change, so they can be cached forever.
+        year_is_over = year < datetime.date.today().year
+        if year_is_over and year in self._year_cache:
+            return [e for e in self._year_cache[year] if self._in_date_range(e.start_date, e.end_date, date_range)]
+        soup = self._get_page(f'https://www.pdga.com/player/{self.pdga_number}/stats/{str(year)}', cache_forever=year_is_over)
+        # Get the result rows from all tables with a single selector, in document order.
+        rows = soup.select('.table-container table tr.odd, .table-container table tr.even')
+        # Years that are over are cached in full. Otherwise rows outside date_range are skipped before results are built.
+        row_range = None if year_is_over else date_range
         results = []
         for r in rows:
-            place = int(r.find(class_='place').text)
-            try:
-                points = float(r.find(class_='points').text)
-            except ValueError:
-                points = None
-            tournament = r.find('a').text
-            href = r.find('a').attrs['href'].split('#')
+            # Index the cells by class so that the row is only walked once.
+            cells = {td['class'][0]: td for td in r.find_all('td', recursive=False) if td.get('class')}
+            start_date, end_date = self._parse_dates(cells['dates'].text)
+            if not self._in_date_range(start_date, end_date, row_range):
+                continue
+            place = int(cells['place'].text)
+            points_text = cells['points'].text.strip()
+            points = float(points_text) if points_text[:1].isdigit() else None
+            link = cells['tournament'].find('a')
+            tournament = link.text
+            href = link.attrs['href'].split('#')
             event_url = 'https://www.pdga.com' + href[0]
             division = href[1]
-            tier = r.find(class_='tier').text
-            start_date, end_date = self._parse_dates(r.find(class_='dates').text)
+            tier = cells['tier'].text
             results.append(TournamentResult(place, points, tournament, event_url, division, tier, start_date, end_date))
         # If the year given is invalid the PDGA site will give results for current year. So if given year and
         # and tournament dates doesn't match, return empty list.
         if results and results[0].start_date.year != year and results[0].end_date.year != year:
             results = []
+        if year_is_over:
+            self._year_cache[year] = results
+            results = [e for e in results if self._in_date_range(e.start_date, e.end_date, date_range)]
         return results
 
     def round_results_for_event(self, event_url: str) -> list[RoundResult]:
@@ -182,32 +204,37 @@ class Player:
         Returns:
             list[RoundResult]: The round results for the event.
         """
-        html = requests.get(event_url).text
-        soup = BeautifulSoup(html, 'html.parser')
-        row = soup.find(class_='pdga-number', text=self.pdga_number).parent 
+        soup = self._get_page(event_url)
+        row = soup.find('td', class_='pdga-number', string=self.pdga_number).parent
         head = row.parent.parent.find('thead')
-        round_ths = head.find_all(class_='round tooltip')
-        scores = row.find_all(class_='round')
-        ratings = row.find_all(class_='round-rating')
+        round_ths = head.find_all('th', class_='round tooltip')
+        # Collect round scores and round ratings from the player's row in a single pass.
+        scores = []
+        ratings = []
+        for td in row.find_all('td', class_=['round', 'round-rating'], recursive=False):
+            if 'round' in td['class']:
+                scores.append(td)
+            else:
+                ratings.append(td)
+        # Index elements by id once, rather than searching the whole page for each round's tooltip.
+        elements_by_id = {e['id']: e for e in soup.find_all(id=True)} if round_ths else {}
         round_results = []
         for i in range(len(scores)):
             course = None
             par = None
             if round_ths:
-                round_tool_tip = soup.find(id=round_ths[i].attrs['data-tooltip-content'].strip('#'))
+                round_tool_tip = elements_by_id[round_ths[i].attrs['data-tooltip-content'].strip('#')]
                 tool_tip_parts = round_tool_tip.text.split(';')
                 course = tool_tip_parts[0].strip()
-                par = int(re.findall(r'\d+', tool_tip_parts[2])[0])
-            try:
-                score=int(scores[i].text)
-            except:
+                par = int(_RE_INT.findall(tool_tip_parts[2])[0])
+            score_text = scores[i].text.strip()
+            if not score_text.isdigit():
                 # Player did not participate in this round
                 continue
-            try:
-                rating=int(ratings[i].text)
-            except:
-                # Maybe a play-off or non-standard event?
-                rating = None
+            score = int(score_text)
+            rating_text = ratings[i].text.strip() if i < len(ratings) else ''
+            # No rating? Maybe a play-off or non-standard event.
+            rating = int(rating_text) if rating_text.isdigit() else None
             round_results.append(RoundResult(course=course, par=par, score=score, rating=rating))
         return round_results
 
@@ -221,9 +248,10 @@ class Player:
         # Find date for last round rating included in last rating. We'll search for new events from there.
         last_date = round_ratings[0].date
         # Find new events and append dates and ratings to our list
-        new_events = self.events_from_period(last_date + dateutil.relativedelta.relativedelta(days=1), datetime.date.today())
-        for e in new_events:
-            round_results = self.round_results_for_event(e.event_url)
+        new_events = self.events_from_period(last_date + datetime.timedelta(days=1), datetime.date.today())
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            event_results = executor.map(self.round_results_for_event, [e.event_url for e in new_events])
+        for e, round_results in zip(new_events, event_results):
             for r in round_results:
                 if r.rating:
                     # There's no way to extract round dates, so we'll have to go with event date.
@@ -233,20 +261,70 @@ class Player:
         rating.update(round_ratings, order=Rating.DataOrder.UNSORTED)
         return rating.rating
 
+    @classmethod
+    def _get_session(cls):
+        """Get the session shared by all players, creating it on first use.
+
+        Responses are cached on disk so that pages aren't downloaded again on every run.
+
+        Returns:
+            requests_cache.CachedSession: The shared session.
+        """
+        if cls._session is None:
+            session = requests_cache.CachedSession('pdga_cache', backend='sqlite', use_cache_dir=True,
+                                                   expire_after=datetime.timedelta(hours=6))
+            session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+            session.headers.update({'Accept-Encoding': 'gzip'})
+            cls._session = session
+        return cls._session
+
+    def _get_page(self, url: str, cache_forever: bool=False) -> BeautifulSoup:
+        """Download and parse a page from the PDGA website.
+
+        The parser is given the raw bytes and detects the encoding itself, so the page is only decoded once.
+
+        Args:
+            url (str): The URL of the page.
+            cache_forever (bool): Cache the response without expiry. (Default: False)
+
+        Returns:
+            BeautifulSoup: The parsed page.
+        """
+        expire_after = requests_cache.NEVER_EXPIRE if cache_forever else None
+        response = self._get_session().get(url, timeout=self._timeout, expire_after=expire_after)
+        return BeautifulSoup(response.content, 'lxml')
+
+    def _in_date_range(self, start_date: datetime.date, end_date: datetime.date,
+                       date_range: tuple[datetime.date, datetime.date]) -> bool:
+        """Check if a period overlaps a date range.
+
+        Args:
+            start_date (date): The first date of the period.
+            end_date (date): The last date of the period.
+            date_range (tuple[date, date]): The first and last dates of the range, or None for no limits.
+
+        Returns:
+            bool: True if any part of the period is within the range, False if not.
+        """
+        return not date_range or (end_date >= date_range[0] and start_date <= date_range[1])
+
     def _parse_dates(self, date_str: str) -> tuple[datetime.date, datetime.date]:
         """Return start and end dates from a PDGA table date string.
         
         Args:
-            date_str (str): Date(s) in either of the formats "DD-Mon-YEAR" or "DD-Mon to DD-Mon-YEAR".
+            date_str (str): Date(s) in any of the formats "DD-Mon-YEAR", "DD-Mon to DD-Mon-YEAR" or
+                "DD-Mon-YEAR to DD-Mon-YEAR".
 
         Returns:
             tuple[date, date]: Start date and end date.
         """
-        dates = date_str.split(' to ')
-        year = dates[-1].strip()[-4:]
-        start_date = datetime.datetime.strptime(dates[0] if dates[0].endswith(year) else f'{dates[0]}-{year}', '%d-%b-%Y')
-        end_date = datetime.datetime.strptime(dates[-1], '%d-%b-%Y')
-        return start_date.date(), end_date.date()
+        # The format is fixed, so match it once and build the dates directly instead of using the (slow) strptime.
+        start_day, start_month, start_year, end_day, end_month, end_year = _RE_DATE_RANGE.search(date_str).groups()
+        end_date = datetime.date(int(end_year), _MONTHS[end_month], int(end_day))
+        if not start_day:
+            return end_date, end_date
+        start_date = datetime.date(int(start_year or end_year), _MONTHS[start_month], int(start_day))
+        return start_date, end_date
         
 
 class Rating:
@@ -293,12 +371,16 @@ class Rating:
         # Calculate
         included = Rating.round_ratings_in_date_range(round_ratings, most_recent_round_date, order)
         included = Rating.remove_outliers(included)
-        with_doubled = Rating.double_most_recent_quarter(included)
-        rating = statistics.fmean([x.rating for x in with_doubled])
+        # Same as the mean of double_most_recent_quarter(included), but without building the doubled list.
+        n = len(included)
+        i = n if n < 9 else math.ceil(0.75 * n)
+        total = sum(r.rating for r in included) + sum(included[j].rating for j in range(i, n))
+        rating = total / (2 * n - i)
 
         # Update attributes
         self.rating = round(rating) # Is this the correct?
-        self.included = sorted(included, key=lambda i: (i.date, i.rating))
+        # remove_outliers already sorts by date then rating.
+        self.included = included
         if as_of:
             self.as_of = as_of
 
@@ -335,20 +417,16 @@ class Rating:
         if not most_recent_round_date:
             most_recent_round_date = sorted_rr[-1].date
 
-        # Find ratings within a 12 month period
-        m12 = most_recent_round_date - dateutil.relativedelta.relativedelta(months=12)
-        ratings = [r for r in sorted_rr if r.date >= m12 and r.date <= most_recent_round_date]
-
-        # If needed, find more ratings within a 24 month period
-        m24 = most_recent_round_date - dateutil.relativedelta.relativedelta(months=24)
-        while len(ratings) < 8:
-            # Find the index in round_ratings for the first item in ratings
-            i = sorted_rr.index(ratings[0]) if ratings else len(sorted_rr)
-            # Insert the item on the index before that (if it's within the 24 month period)
-            if i <= 0 or sorted_rr[i - 1].date < m24:
-                break
-            ratings.insert(0, sorted_rr[i - 1])
-        return ratings
+        # Find ratings within a 12 month period. The list is sorted by date, so the period is a slice.
+        m12 = Rating._months_before(most_recent_round_date, 12)
+        first = bisect.bisect_left(sorted_rr, m12, key=lambda r : r.date)
+        last = bisect.bisect_right(sorted_rr, most_recent_round_date, key=lambda r : r.date)
+
+        # If needed, move the start of the slice back to find more ratings within a 24 month period
+        m24 = Rating._months_before(most_recent_round_date, 24)
+        while last - first < 8 and first > 0 and sorted_rr[first - 1].date >= m24:
+            first -= 1
+        return sorted_rr[first:last]
 
     @staticmethod
     def remove_outliers(round_ratings: list[RoundRating]) -> list[RoundRating]:
@@ -364,15 +442,16 @@ class Rating:
         Returns:
             list[RoundRating]: Round ratings without outliers, sorted by date then rating.        
         """
-        sorted_rr = sorted(round_ratings, key=lambda r : r.rating, reverse=True)
-        ratings = [r.rating for r in sorted_rr]
+        ratings = [r.rating for r in round_ratings]
         avg = statistics.fmean(ratings)
-        sd = statistics.pstdev(ratings)
-        result = []
-        for r in sorted_rr:
-            diff = avg - r.rating
-            if (diff < sd * 2.5 and diff < 100.0) or len(result) < 7:
-                result.append(r)
+        sd = statistics.pstdev(ratings, avg)
+        # Ratings more than 2.5sd or 100pts below average are outliers. Filtering keeps the input order, which is
+        # usually by date already, so the final sort is cheap.
+        limit = avg - min(sd * 2.5, 100.0)
+        result = [r for r in round_ratings if r.rating > limit]
+        if len(result) < 7:
+            # Keep the 7 best rounds.
+            result = heapq.nlargest(7, round_ratings, key=lambda r : r.rating)
         return sorted(result, key=lambda r : (r.date, r.rating))
 
     @staticmethod
@@ -391,6 +470,25 @@ class Rating:
         i = len(round_ratings) if len(round_ratings) < 9 else math.ceil(0.75 * len(round_ratings))
         return round_ratings + round_ratings[i:]
 
+    @staticmethod
+    def _months_before(date: datetime.date, months: int) -> datetime.date:
+        """Return the date given number of months before date.
+
+        If the day doesn't exist in the resulting month the last day of that month is used, e.g. one month before
+        31-Mar is 28-Feb or 29-Feb.
+
+        Args:
+            date (date): The date to count from.
+            months (int): Number of months to go back.
+
+        Returns:
+            date: The resulting date.
+        """
+        year, month = divmod(date.year * 12 + date.month - 1 - months, 12)
+        month += 1
+        day = min(date.day, calendar.monthrange(year, month)[1])
+        return datetime.date(year, month, day)
+
 
 class CLI(cmd.Cmd):
     """Simple command-line interface to use some of the tools.
@@ -1,23 +1,58 @@
-from posixpath import curdir
-import unittest, sys, os
+import unittest, sys, os, functools, pathlib, threading, datetime
 from unittest import mock
 from datetime import date
-sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from bs4 import BeautifulSoup
+import requests_cache
+for path in (os.path.join(os.path.dirname(__file__)), os.path.join(os.path.dirname(__file__), '..')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+import pdgatools
 from pdgatools import Player, RoundRating, RoundResult, TournamentResult
 
-def requests_get(url):
-    """Mock requests.get."""
-    return get_web_page(url)
+# Mocked responses, by URL. pdgatools requests pages from several threads, so guard it with a lock.
+_response_cache = {}
+_response_cache_lock = threading.Lock()
+
+def requests_get(url, **kwargs):
+    """Mock the get method of the session. The same response object is returned for repeated requests of a URL."""
+    with _response_cache_lock:
+        response = _response_cache.get(url)
+        if response is None:
+            response = get_web_page(url)
+            _response_cache[url] = response
+    return response
+
+class MockSession:
+    """Mock for the session shared by all players. Nothing is downloaded or cached on disk."""
+    def get(self, url, **kwargs):
+        return requests_get(url, **kwargs)
 
 class TestPlayer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Replace the network with local files for all tests.
+        cls._orig_session = Player._session
+        Player._session = MockSession()
+        # Several tests get the same pages. Parse each page only once.
+        cls._orig_soup = pdgatools.BeautifulSoup
+        pdgatools.BeautifulSoup = parse_page
+        # Players are only read by the tests, so they can be shared.
+        cls.p_kj = Player(41760)
+        cls.p_tn = Player(140592)
+        cls.p_ab = Player(44382)
+        cls.p_nq = Player(68286)
+
+    @classmethod
+    def tearDownClass(cls):
+        Player._session = cls._orig_session
+        pdgatools.BeautifulSoup = cls._orig_soup
+
     def setUp(self):
         pass
 
-    @mock.patch('pdgatools.requests.get', mock.Mock(side_effect=requests_get))
     def test_init(self):
         # Init sets basic player stats
-        p = Player(41760)
+        p = self.p_kj
         self.assertEqual('Kevin Jones', p.name)
         self.assertEqual('Greenwood, Arkansas, United States', p.location)
         self.assertEqual(2009, p.since)
@@ -27,7 +62,6 @@ class TestPlayer(unittest.TestCase):
         self.assertEqual(41, p.wins)
         self.assertEqual(156998.99, p.earnings)
 
-    @mock.patch('pdgatools.requests.get', mock.Mock(side_effect=requests_get))
     def test_init_new_player(self):
         # Some fields not present: rating, events, etc
         p = Player(198422)
@@ -40,10 +74,9 @@ class TestPlayer(unittest.TestCase):
         self.assertEqual(0, p.wins)
         self.assertEqual(0.0, p.earnings)
 
-    @mock.patch('pdgatools.requests.get', mock.Mock(side_effect=requests_get))
     def test_included_round_ratings(self):
         # Use Kevin Jones results downloaded January 2022.
-        p = Player(41760)
+        p = self.p_kj
         expected_first_three = [
             RoundRating(date=date(2021, 9, 26), rating=1070),
             RoundRating(date=date(2021, 9, 26), rating=1027),
@@ -61,10 +94,9 @@ class TestPlayer(unittest.TestCase):
         self.assertNotIn(expected_not_included, actual)
         self.assertEqual(76, len(actual))
 
-    @mock.patch('pdgatools.requests.get', mock.Mock(side_effect=requests_get))
     def test_events_from_year_kj_2021(self):
         # Use Kevin Jones results from 2021 downloaded January 2022.
-        p = Player(41760)
+        p = self.p_kj
         expected_first = TournamentResult(
             place=7,
             points=1300.0,
@@ -101,10 +133,9 @@ class TestPlayer(unittest.TestCase):
         self.assertIn(expected_in, actual)
         self.assertEqual(27, len(actual))
 
-    @mock.patch('pdgatools.requests.get', mock.Mock(side_effect=requests_get))
     def test_events_from_year_kj_2020(self):
         # Use Kevin Jones results from 2021 downloaded January 2022.
-        p = Player(41760)
+        p = self.p_kj
         expected_first = TournamentResult(
             place=6,
             points=1450.0,
@@ -119,17 +150,15 @@ class TestPlayer(unittest.TestCase):
         self.assertEqual(expected_first, actual[0])
         self.assertEqual(23, len(actual))
 
-    @mock.patch('pdgatools.requests.get', mock.Mock(side_effect=requests_get))
     def test_events_from_year_invalid_year(self):
         # There were no results from 2022 at the time of writing.
-        p = Player(41760)
+        p = self.p_kj
         actual = p.events_from_year(2022)
         self.assertEqual(0, len(actual))
 
-    @mock.patch('pdgatools.requests.get', mock.Mock(side_effect=requests_get))
     def test_events_from_year_multiple_divisions(self):
         # This player played in both recreational and intermediate during 2020.
-        p = Player(140592)
+        p = self.p_tn
         expected = [
             TournamentResult(30, 48.0, 'Smålandstouren Älmhult Open', 'https://www.pdga.com/tour/event/45639', 'MA2', 'C', date(2020, 7, 18), date(2020, 7, 18)),
             TournamentResult(27, 48.0, 'Ljungby Open', 'https://www.pdga.com/tour/event/46771', 'MA2', 'C', date(2020, 8, 15), date(2020, 8, 15)),
@@ -138,9 +167,41 @@ class TestPlayer(unittest.TestCase):
         actual = p.events_from_year(2020)
         self.assertListEqual(expected, actual)
 
+    def test_events_from_year_cached(self):
+        # Results from years that are over should only be downloaded once, and cached without expiry. Other pages use
+        # the default expiry of the session. Use a new player so that nothing is cached already.
+        with mock.patch.object(Player._session, 'get', mock.Mock(side_effect=requests_get)) as get:
+            p = Player(41760)
+            expected = p.events_from_year(2021)
+            actual = p.events_from_year(2021)
+        self.assertListEqual(expected, actual)
+        calls = {c.args[0]: c.kwargs for c in get.call_args_list}
+        urls = [c.args[0] for c in get.call_args_list]
+        self.assertEqual(1, urls.count('https://www.pdga.com/player/41760/stats/2021'))
+        self.assertEqual(requests_cache.NEVER_EXPIRE, calls['https://www.pdga.com/player/41760/stats/2021']['expire_after'])
+        self.assertIsNone(calls['https://www.pdga.com/player/41760'].get('expire_after'))
+
+    def test_events_from_year_current(self):
+        # The current year isn't cached, and events outside date_range are skipped while the page is read. Pretend
+        # that it's still 2021 and use a new player so that nothing is cached already.
+        class Today(date):
+            @classmethod
+            def today(cls):
+                return cls(2021, 12, 31)
+        p = Player(41760)
+        expected = [
+            TournamentResult(54, 790.0, 'DGPT - Waco Annual Charity Open presented by Prodigy Disc', 'https://www.pdga.com/tour/event/48685', 'MPO', 'NT', date(2021, 3, 12), date(2021, 3, 14)),
+            TournamentResult(14, 1050.0, 'Discraft presents The Open at Belton a DGPT Silver Series Event', 'https://www.pdga.com/tour/event/47888', 'MPO', 'A/B', date(2021, 3, 19), date(2021, 3, 21)),
+            TournamentResult(5, 1360.0, '26th Annual Texas State Disc Golf Championship Presented by Latitude 64 - National Tour', 'https://www.pdga.com/tour/event/47512', 'MPO', 'NT', date(2021, 3, 26), date(2021, 3, 28))
+        ]
+        with mock.patch.object(pdgatools, 'datetime', mock.Mock(wraps=datetime, date=Today)):
+            actual = p.events_from_year(2021, (date(2021, 3, 14), date(2021, 3, 26)))
+        self.assertListEqual(expected, actual)
+        self.assertDictEqual({}, p._year_cache)
+
     def test_events_from_period(self):
         # Use Kevin Jones results from 2020-2021 downloaded January 2022.
-        p = Player(41760)
+        p = self.p_kj
         actual = p.events_from_period(date(2020, 11, 10), date(2021, 2, 28))
         expected = [
             TournamentResult(5, 570.0, 'Dynamic Discs Northwest Arkansas Presents: Northwest Arkansas Open', 'https://www.pdga.com/tour/event/43682', 'MPO', 'A', date(2020, 11, 13), date(2020, 11, 15)),
@@ -148,23 +209,20 @@ class TestPlayer(unittest.TestCase):
         ]
         self.assertListEqual(expected, actual)
 
-    @mock.patch('pdgatools.requests.get', mock.Mock(side_effect=requests_get))
-    def test_round_results_for_event(self):
-        # Ordinary tournament (Las Vegas Challenge 2021) played by Kevin Jones downloaded January 2022.
-        p = Player(41760)
-        expected = [
-            RoundResult('Infinite', 59, 53, 1028),
-            RoundResult('Innova', 62, 53, 1041),
-            RoundResult('Factory Store', 61, 53, 1046),
-            RoundResult('Innova Finals', 62, 50, 1082)
-        ]
-        actual = p.round_results_for_event('https://www.pdga.com/tour/event/47877')
-        self.assertListEqual(expected, actual)
+    def test_parse_dates(self):
+        p = self.p_kj
+        cases = (
+            ('30-Dec-2021 to 02-Jan-2022', (date(2021, 12, 30), date(2022, 1, 2))),
+            ('25-Feb to 28-Feb-2021', (date(2021, 2, 25), date(2021, 2, 28))),
+            ('18-Jul-2020', (date(2020, 7, 18), date(2020, 7, 18)))
+        )
+        for date_str, expected in cases:
+            with self.subTest(date_str=date_str):
+                self.assertTupleEqual(expected, p._parse_dates(date_str))
 
-    @mock.patch('pdgatools.requests.get', mock.Mock(side_effect=requests_get))
     def test_round_results_for_event(self):
         # Ordinary tournament (Las Vegas Challenge 2021) played by Kevin Jones downloaded January 2022.
-        p = Player(41760)
+        p = self.p_kj
         expected = [
             RoundResult('Infinite', 59, 53, 1028),
             RoundResult('Innova', 62, 53, 1041),
@@ -174,22 +232,20 @@ class TestPlayer(unittest.TestCase):
         actual = p.round_results_for_event('https://www.pdga.com/tour/event/47877')
         self.assertListEqual(expected, actual)
 
-    @mock.patch('pdgatools.requests.get', mock.Mock(side_effect=requests_get))
     def test_round_results_for_event_putting_contest(self):
         # Putting Contest at 2021 Pro Worlds played by Kevin Jones downloaded January 2022.
         # This event has no info on course or par, nor on round rating.
-        p = Player(41760)
+        p = self.p_kj
         expected = [
             RoundResult(None, None, 999, None),
         ]
         actual = p.round_results_for_event('https://www.pdga.com/tour/event/51684')
         self.assertListEqual(expected, actual)
 
-    @mock.patch('pdgatools.requests.get', mock.Mock(side_effect=requests_get))
     def test_round_results_for_event_w_link_to_course(self):
         # Savannah Open 2021 played by Nathan Queen downloaded January 2022.
         # This event has the course name partly embedded in an anchor tag.
-        p = Player(68286)
+        p = self.p_nq
         expected = [
             RoundResult('Tom Triplett Disc Golf Course - Black', 62, 59, 1012),
             RoundResult('Tom Triplett Disc Golf Course - Red', 55, 51, 979),
@@ -199,88 +255,84 @@ class TestPlayer(unittest.TestCase):
         actual = p.round_results_for_event('https://www.pdga.com/tour/event/47932')
         self.assertListEqual(expected, actual)
 
-    @mock.patch('pdgatools.requests.get', mock.Mock(side_effect=requests_get))
     def test_estimate_next_rating(self):
         # Anthony Barela at this point had played one more event which increased his rating
         # from 1024 to 1026.
-        p = Player(44382)
+        p = self.p_ab
         expected = 1026
         actual = p.estimate_next_rating()
         self.assertEqual(expected, actual)
 
-    @mock.patch('pdgatools.requests.get', mock.Mock(side_effect=requests_get))
     def test_estimate_next_rating_rounds_wo_rating(self):
         # Sometimes events includes rounds that aren't rated. This shouldn't cause errors.
         # In this case Nathan Queen played an event after his last rating that included
         # a short final round that wasn't rated.
-        p = Player(68286)
+        p = self.p_nq
         expected = 1027
         actual = p.estimate_next_rating()
         self.assertEqual(expected, actual)
 
+CUR_DIR = os.path.abspath(os.path.curdir)
+TEST_DIR = CUR_DIR if CUR_DIR.endswith('test') else os.path.join(CUR_DIR, 'test')
+HTML_DIR = os.path.join(TEST_DIR, 'html')
+
+# Local copies of PDGA pages, by URL.
+URL_TO_FILE = {
+    'https://www.pdga.com/player/41760/details': 'kj_included.html',
+    'https://www.pdga.com/player/44382/details': 'ab_included.html',
+    'https://www.pdga.com/player/68286/details': 'nq_included.html',
+    'https://www.pdga.com/player/41760/stats/2020': 'kj_stats_2020.html',
+    'https://www.pdga.com/player/41760/stats/2021': 'kj_stats_2021.html',
+    'https://www.pdga.com/player/41760': 'kj_stats_2021.html',
+    # The PDGA site returns the results from the last year they had records.
+    # In this case, we pretend that 2021 was the last year they did so.
+    'https://www.pdga.com/player/41760/stats/2022': 'kj_stats_2021.html',
+    'https://www.pdga.com/player/140592/stats/2020': 'tn_stats_2020.html',
+    'https://www.pdga.com/player/44382/stats/2021': 'ab_stats_2021.html',
+    'https://www.pdga.com/player/44382/stats/2022': 'ab_stats_2022.html',
+    'https://www.pdga.com/player/44382': 'ab_stats_2022.html',
+    'https://www.pdga.com/player/68286/stats/2022': 'nq_stats_2022.html',
+    'https://www.pdga.com/player/68286': 'nq_stats_2022.html',
+    'https://www.pdga.com/player/140592': 'tn_stats_2021.html',
+    'https://www.pdga.com/player/198422': 'rvl_stats.html',
+    # Las Vegas Challenge presented by Innova 2021
+    'https://www.pdga.com/tour/event/47877': 'lvc_event.html',
+    # Long Drive Contest at 2021 Pro Worlds 2021
+    'https://www.pdga.com/tour/event/51685': 'ldc_event.html',
+    # Putting Contest at 2021 Pro Worlds
+    'https://www.pdga.com/tour/event/51684': 'pcw_event.html',
+    # Savannah Open 2021
+    'https://www.pdga.com/tour/event/47932': 'so_event.html',
+    # Shelly Sharpe Memorial 2022
+    'https://www.pdga.com/tour/event/55325': 'ssm_event.html',
+    # Savannah Open 2022
+    'https://www.pdga.com/tour/event/55390': 'so2022_event.html',
+}
+
 def get_web_page(url):
-    """Mock for requests.get. Returns an object with the text attribute set to html for given url."""
+    """Mock for the get method of the session. Returns an object with the text attribute set to html for given url."""
     class MockResponse:
         def __init__(self, html, status_code):
             self.text = html
+            self.content = html.encode('utf-8')
             self.status_code = status_code
-    cur_dir = os.path.abspath(os.path.curdir)
-    test_dir = cur_dir if cur_dir.endswith('test') else os.path.join(cur_dir, 'test')
-    html_dir = 'html'
-    file = ''
+    file = URL_TO_FILE.get(url, '')
     content = ''
-    status_code = 200
-    if url == 'https://www.pdga.com/player/41760/details':
-        file = 'kj_included.html'
-    elif url == 'https://www.pdga.com/player/44382/details':
-        file = 'ab_included.html'
-    elif url == 'https://www.pdga.com/player/68286/details':
-        file = 'nq_included.html'
-    elif url == 'https://www.pdga.com/player/41760/stats/2020':
-        file = 'kj_stats_2020.html'
-    elif url == 'https://www.pdga.com/player/41760/stats/2021' or url == 'https://www.pdga.com/player/41760':
-        file = 'kj_stats_2021.html'
-    elif url == 'https://www.pdga.com/player/41760/stats/2022':
-        # The PDGA site returns the results from the last year they had records.
-        # In this case, we pretend that 2021 was the last year they did so.
-        file = 'kj_stats_2021.html'
-    elif url == 'https://www.pdga.com/player/140592/stats/2020':
-        file = 'tn_stats_2020.html'
-    elif url == 'https://www.pdga.com/player/44382/stats/2021':
-        file = 'ab_stats_2021.html'
-    elif url == 'https://www.pdga.com/player/44382/stats/2022' or url == 'https://www.pdga.com/player/44382':
-        file = 'ab_stats_2022.html'
-    elif url == 'https://www.pdga.com/player/68286/stats/2022' or url == 'https://www.pdga.com/player/68286':
-        file = 'nq_stats_2022.html'
-    elif url == 'https://www.pdga.com/player/140592':
-        file = 'tn_stats_2021.html'
-    elif url == 'https://www.pdga.com/player/198422':
-        file = 'rvl_stats.html'
-    elif url == 'https://www.pdga.com/tour/event/47877':
-        # Las Vegas Challenge presented by Innova 2021
-        file = 'lvc_event.html'
-    elif url == 'https://www.pdga.com/tour/event/51685':
-        # Long Drive Contest at 2021 Pro Worlds 2021
-        file = 'ldc_event.html'
-    elif url == 'https://www.pdga.com/tour/event/51684':
-        # Putting Contest at 2021 Pro Worlds
-        file = 'pcw_event.html'
-    elif url == 'https://www.pdga.com/tour/event/47932':
-        # Savannah Open 2021
-        file = 'so_event.html'
-    elif url == 'https://www.pdga.com/tour/event/55325':
-        # Shelly Sharpe Memorial 2022
-        file = 'ssm_event.html'
-    elif url == 'https://www.pdga.com/tour/event/55390':
-        # Savannah Open 2022
-        file = 'so2022_event.html'
-    else:
-        status_code = 404
+    status_code = 200 if file else 404
     if file:
-        with open(os.path.join(test_dir, html_dir, file), 'r') as f:
-            content = f.read()
+        content = load_fixture(os.path.join(HTML_DIR, file))
     return MockResponse(content, status_code)
 
+@functools.lru_cache(maxsize=None)
+def parse_page(markup, features):
+    """Mock BeautifulSoup. Pages are read only by pdgatools, so the same parsed page can be returned every time."""
+    return BeautifulSoup(markup, features)
+
+@functools.lru_cache(maxsize=None)
+def load_fixture(path):
+    """Return the content of an html file. Each file is only read from disk once."""
+    return pathlib.Path(path).read_text(encoding='cp1252')
+
 if __name__ == '__main__':
     unittest.main()
     #with open('nq_included.html', 'w') as f: